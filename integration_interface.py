@@ -33,13 +33,9 @@ class PrintQueueIntegration:
     
     def get_job_metadata(self, job_id: str = None) -> Dict:
         """Get metadata for all jobs or specific job"""
-        status = self.priority_manager.get_queue_status()
         if job_id:
-            for job in status['jobs']:
-                if job['job_id'] == job_id:
-                    return job
-            return None
-        return status
+            return self.priority_manager.get_job(job_id)
+        return self.priority_manager.get_queue_status()
     
     # === INTERFACE FOR MODULE 3: Job Expiry & Cleanup ===
     def set_expiry_notification_callback(self, callback: Callable):
@@ -53,25 +49,12 @@ class PrintQueueIntegration:
     
     def cleanup_expired_jobs(self) -> int:
         """Manual cleanup trigger (returns number of jobs cleaned)"""
-        old_count = self.priority_manager.queue.size()
-        self.priority_manager.get_queue_status()  # Triggers cleanup
-        new_count = self.priority_manager.queue.size()
-        return old_count - new_count
+        return self.priority_manager.cleanup_expired_jobs()
     
     # === INTERFACE FOR MODULE 4: Concurrent Job Submission ===
     def submit_simultaneous_jobs(self, job_list: List[Dict]) -> Dict[str, bool]:
         """Handle simultaneous job submissions safely"""
-        results = {}
-        for job_data in job_list:
-            success = self.priority_manager.submit_job(
-                job_data['job_id'],
-                job_data['user_id'],
-                job_data['document_name'],
-                job_data['pages'],
-                job_data.get('priority', 1)
-            )
-            results[job_data['job_id']] = success
-        return results
+        return self.priority_manager.submit_jobs(job_list)
     
     def is_thread_safe(self) -> bool:
         """Confirm thread safety for concurrent operations"""
@@ -111,6 +94,11 @@ class PrintQueueIntegration:
             'timestamp': status.get('timestamp', 'now')
         }
     
+    def get_visualization_columns(self) -> Dict[str, list]:
+        """Get queue data column-wise for renderers that redraw every frame"""
+        # created_at is epoch seconds here rather than an ISO string
+        return self.priority_manager.get_queue_columns()
+    
     def get_print_order_report(self) -> List[Dict]:
         """Get jobs in the order they will be printed"""
         status = self.priority_manager.get_queue_status()
@@ -1,8 +1,11 @@
 # priority_job.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
+import time
+
+MAX_PRIORITY = 5
 
 class JobStatus(Enum):
     PENDING = "pending"
@@ -10,7 +13,7 @@ class JobStatus(Enum):
     COMPLETED = "completed"
     EXPIRED = "expired"
 
-@dataclass
+@dataclass(slots=True)
 class PriorityJob:
     """Represents a print job with priority and aging capabilities"""
     job_id: str
@@ -22,30 +25,60 @@ class PriorityJob:
     status: JobStatus = JobStatus.PENDING
     aging_interval: int = 300  # seconds (5 minutes default)
     max_wait_time: int = 3600  # seconds (1 hour default)
+    _created_ns: int = field(init=False, repr=False, compare=False)
+    _aging_interval_ns: int = field(init=False, repr=False, compare=False)
+    _max_wait_ns: int = field(init=False, repr=False, compare=False)
+    created_at_iso: str = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
+        # Waiting is measured in integer monotonic nanoseconds; created_at is kept for display
         if self.created_at is None:
             self.created_at = datetime.now()
+            self._created_ns = time.monotonic_ns()
+        else:
+            already_waited_us = (datetime.now() - self.created_at) // timedelta(microseconds=1)
+            self._created_ns = time.monotonic_ns() - already_waited_us * 1000
+        self.created_at_iso = self.created_at.isoformat()
+        self._aging_interval_ns = int(self.aging_interval * 1_000_000_000)
+        self._max_wait_ns = int(self.max_wait_time * 1_000_000_000)
     
-    @property
-    def current_priority(self) -> int:
-        """Calculate current priority based on aging"""
-        if self.status != JobStatus.PENDING:
+    def current_priority_at(self, now: int) -> int:
+        """Calculate priority based on aging at monotonic time `now` (ns)"""
+        if self.status is not JobStatus.PENDING:
             return self.initial_priority
             
-        time_waited = datetime.now() - self.created_at
-        aging_increments = int(time_waited.total_seconds() // self.aging_interval)
+        aging_increments = (now - self._created_ns) // self._aging_interval_ns
         
         # Cap priority at 5 (highest)
-        return min(5, self.initial_priority + aging_increments)
+        return min(MAX_PRIORITY, self.initial_priority + aging_increments)
+    
+    def next_aging_at(self, now: int) -> float:
+        """Get the monotonic time (ns) of the next priority increase after `now`"""
+        if self.current_priority_at(now) >= MAX_PRIORITY:
+            return float('inf')  # Already capped, priority can no longer change
+        
+        aging_increments = (now - self._created_ns) // self._aging_interval_ns
+        return self._created_ns + (aging_increments + 1) * self._aging_interval_ns
+    
+    def is_expired_at(self, now: int) -> bool:
+        """Check if job has exceeded maximum wait time at monotonic time `now` (ns)"""
+        return now - self._created_ns > self._max_wait_ns
+    
+    def wait_time_at(self, now: int) -> float:
+        """Get wait time in seconds at monotonic time `now` (ns)"""
+        return (now - self._created_ns) / 1_000_000_000
+    
+    @property
+    def current_priority(self) -> int:
+        """Calculate current priority based on aging"""
+        return self.current_priority_at(time.monotonic_ns())
     
     @property
     def is_expired(self) -> bool:
         """Check if job has exceeded maximum wait time"""
-        time_waited = datetime.now() - self.created_at
-        return time_waited.total_seconds() > self.max_wait_time
+        return self.is_expired_at(time.monotonic_ns())
     
     @property
     def wait_time_seconds(self) -> float:
         """Get current wait time in seconds"""
-        return (datetime.now() - self.created_at).total_seconds()
\ No newline at end of file
+        return self.wait_time_at(time.monotonic_ns())
\ No newline at end of file
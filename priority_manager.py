@@ -1,70 +1,142 @@
 # priority_manager.py
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import partial
+from operator import attrgetter
 import threading
 import time
 from priority_job import PriorityJob, JobStatus
 from priority_queue import PriorityQueue
 
+_by_creation = attrgetter('_created_ns')
+
 class PriorityManager:
     """Main manager for the priority and aging system"""
     
     def __init__(self, default_aging_interval: int = 300, default_max_wait: int = 3600):
         self.queue = PriorityQueue()
-        self.default_aging_interval = default_aging_interval
-        self.default_max_wait = default_max_wait
+        self._default_aging_interval = default_aging_interval
+        self._default_max_wait = default_max_wait
+        self._bind_job_defaults()
         self._lock = threading.RLock()
-        self._running = False
+        self._stop_event = threading.Event()
         self._aging_thread = None
+        self.aging_check_interval = 30  # seconds between background checks
+    
+    @property
+    def default_aging_interval(self) -> int:
+        return self._default_aging_interval
+    
+    @default_aging_interval.setter
+    def default_aging_interval(self, value: int):
+        self._default_aging_interval = value
+        self._bind_job_defaults()
+    
+    @property
+    def default_max_wait(self) -> int:
+        return self._default_max_wait
+    
+    @default_max_wait.setter
+    def default_max_wait(self, value: int):
+        self._default_max_wait = value
+        self._bind_job_defaults()
+    
+    def _bind_job_defaults(self):
+        """Rebuild the positional (job_id, user_id, document_name, pages, initial_priority) constructor"""
+        self._new_job = partial(PriorityJob, aging_interval=self._default_aging_interval,
+                                max_wait_time=self._default_max_wait)
     
     def start_aging_system(self):
         """Start the background aging system"""
-        if not self._running:
-            self._running = True
+        if self._aging_thread is None or not self._aging_thread.is_alive():
+            self._stop_event.clear()
             self._aging_thread = threading.Thread(target=self._aging_worker, daemon=True)
             self._aging_thread.start()
     
     def stop_aging_system(self):
         """Stop the background aging system"""
-        self._running = False
+        self._stop_event.set()  # Wakes the worker immediately
         if self._aging_thread:
             self._aging_thread.join()
+            self._aging_thread = None
     
     def submit_job(self, job_id: str, user_id: str, document_name: str, 
                    pages: int, initial_priority: int = 1,
                    aging_interval: Optional[int] = None,
                    max_wait_time: Optional[int] = None) -> bool:
         """Submit a new print job"""
+        aging_interval = aging_interval or self.default_aging_interval
+        max_wait_time = max_wait_time or self.default_max_wait
+        
+        # Build the job before locking; only the queue insert is shared state
+        job = PriorityJob(
+            job_id=job_id,
+            user_id=user_id,
+            document_name=document_name,
+            pages=pages,
+            initial_priority=initial_priority,
+            aging_interval=aging_interval,
+            max_wait_time=max_wait_time
+        )
+        
+        with self._lock:
+            return self.queue.add_job(job)
+    
+    def submit_jobs(self, job_list: List[Dict]) -> Dict[str, bool]:
+        """Submit a batch of print jobs with a single lock acquisition"""
+        new_job = self._new_job
+        jobs = [
+            new_job(job_data['job_id'], job_data['user_id'], job_data['document_name'],
+                    job_data['pages'], job_data.get('priority', 1))
+            for job_data in job_list
+        ]
+        
+        with self._lock:
+            return {job.job_id: self.queue.add_job(job) for job in jobs}
+    
+    def submit_job_fast(self, job_args: Tuple[str, str, str, int, int]) -> bool:
+        """Submit a job from a (job_id, user_id, document_name, pages, initial_priority) tuple"""
+        job = self._new_job(*job_args)
         with self._lock:
-            aging_interval = aging_interval or self.default_aging_interval
-            max_wait_time = max_wait_time or self.default_max_wait
-            
-            job = PriorityJob(
-                job_id=job_id,
-                user_id=user_id,
-                document_name=document_name,
-                pages=pages,
-                initial_priority=initial_priority,
-                aging_interval=aging_interval,
-                max_wait_time=max_wait_time
-            )
-            
             return self.queue.add_job(job)
     
     def get_next_job(self) -> Optional[dict]:
         """Get the next job to process"""
         with self._lock:
-            job = self.queue.get_next_job()
-            if job:
-                return {
-                    'job_id': job.job_id,
-                    'user_id': job.user_id,
-                    'document_name': job.document_name,
-                    'pages': job.pages,
-                    'current_priority': job.current_priority,
-                    'wait_time': job.wait_time_seconds
-                }
-            return None
+            now = time.monotonic_ns()
+            job = self.queue.get_next_job(now)
+            if not job:
+                return None
+            current_priority = job.current_priority_at(now)
+        
+        return {
+            'job_id': job.job_id,
+            'user_id': job.user_id,
+            'document_name': job.document_name,
+            'pages': job.pages,
+            'current_priority': current_priority,
+            'wait_time': job.wait_time_at(now)
+        }
+    
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Get metadata for a single pending job"""
+        with self._lock:
+            now = time.monotonic_ns()
+            job = self.queue.get_job(job_id, now)
+            if not job:
+                return None
+            current_priority = job.current_priority_at(now)
+        
+        return {
+            'job_id': job.job_id,
+            'user_id': job.user_id,
+            'document_name': job.document_name,
+            'initial_priority': job.initial_priority,
+            'current_priority': current_priority,
+            'wait_time': job.wait_time_at(now),
+            'pages': job.pages,
+            'created_at': job.created_at_iso
+        }
     
     def complete_job(self, job_id: str) -> bool:
         """Mark a job as completed and remove from queue"""
@@ -72,45 +144,43 @@ class PriorityManager:
             completed_job = self.queue.remove_job(job_id)
             return completed_job is not None
     
+    def cleanup_expired_jobs(self) -> int:
+        """Remove expired jobs now and return how many were removed"""
+        with self._lock:
+            return self.queue.cleanup_expired()
+    
     def get_queue_status(self) -> dict:
         """Get comprehensive queue status"""
         with self._lock:
-            snapshot = self.queue.get_queue_snapshot()
-            
-            # Calculate statistics
-            total_jobs = len(snapshot)
-            if total_jobs == 0:
-                return {
-                    'total_jobs': 0,
-                    'avg_wait_time': 0,
-                    'priority_distribution': {},
-                    'jobs': []
-                }
-            
-            avg_wait = sum(job['wait_time'] for job in snapshot) / total_jobs
-            priority_dist = {}
-            for job in snapshot:
-                priority = job['current_priority']
-                priority_dist[priority] = priority_dist.get(priority, 0) + 1
-            
-            return {
-                'total_jobs': total_jobs,
-                'avg_wait_time': avg_wait,
-                'priority_distribution': priority_dist,
-                'jobs': snapshot
-            }
-    
-    def handle_tie_breaking(self, jobs_with_same_priority: List[PriorityJob]) -> PriorityJob:
+            now = time.monotonic_ns()
+            snapshot = self.queue.get_queue_snapshot(now)
+            # Maintained incrementally by the queue, so no extra pass over the jobs
+            status = self.queue.get_statistics(now)
+        
+        status['jobs'] = snapshot
+        return status
+    
+    def get_queue_columns(self) -> Dict[str, list]:
+        """Get queue state as columns (one list per field) for bulk consumers"""
+        with self._lock:
+            return self.queue.get_queue_columns()
+    
+    def handle_tie_breaking(self, jobs_with_same_priority: Optional[List[PriorityJob]] = None) -> Optional[PriorityJob]:
         """Handle tie-breaking using wait time (FIFO)"""
-        return min(jobs_with_same_priority, key=lambda job: job.created_at)
+        if jobs_with_same_priority is None:
+            # The heap key already orders ties by creation time, so the winner is the top
+            with self._lock:
+                return self.queue.get_next_job()
+        return min(jobs_with_same_priority, key=_by_creation)
     
     def _aging_worker(self):
         """Background worker for aging system maintenance"""
-        while self._running:
-            time.sleep(30)  # Check every 30 seconds
+        while not self._stop_event.wait(self.aging_check_interval):
             with self._lock:
-                # The queue automatically handles aging when accessed
-                self.queue.get_queue_snapshot()
+                if self.queue.size() == 0:
+                    continue  # Nothing to age or expire
+                # Expire and age jobs without materializing a snapshot
+                self.queue.refresh()
 
 
 # Example usage and testing
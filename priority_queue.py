@@ -1,40 +1,82 @@
 # priority_queue.py
 import heapq
-from typing import List, Optional, Tuple
-from priority_job import PriorityJob, JobStatus
+import time
+from typing import Dict, List, Optional, Tuple
+from priority_job import PriorityJob, JobStatus, MAX_PRIORITY
+
+# Heap keys pack (priority, creation time, counter) into one int, most significant first
+_COUNTER_BITS = 32
+_TIME_BITS = 64
+_TIME_BIAS = 1 << (_TIME_BITS - 1)  # Keeps back-dated (negative) creation times in range
+_PRIORITY_SHIFT = _TIME_BITS + _COUNTER_BITS
+_COUNTER_MASK = (1 << _COUNTER_BITS) - 1
+
+def _key_priority(priority_key: int) -> int:
+    """Recover the priority a heap key was built with"""
+    return MAX_PRIORITY - (priority_key >> _PRIORITY_SHIFT)
 
 class PriorityQueue:
     """Priority queue with aging support for print jobs"""
     
     def __init__(self):
-        self._heap: List[Tuple[int, float, PriorityJob]] = []
+        self._heap: List[Tuple[int, PriorityJob]] = []
         self._job_lookup = {}  # job_id -> job mapping for quick access
-        self._counter = 0  # For tie-breaking
+        self._entry_keys = {}  # job_id -> key of the job's live heap entry
+        self._dirty_count = 0  # Dead entries still sitting in the heap
+        self._priority_counts = {}  # priority -> number of live entries at it
+        self._created_sum = 0  # Sum of live jobs' monotonic creation times (ns)
+        self._next_aging_at = float('inf')  # Earliest time any job's priority can change
+        self._next_expiry_at = float('inf')  # Latest time before some job may expire
+        self._counter = 0  # Submission sequence, for tie-breaking
     
     def add_job(self, job: PriorityJob) -> bool:
         """Add a job to the priority queue"""
         if job.job_id in self._job_lookup:
             return False  # Job already exists
         
-        # Use negative priority for max-heap behavior (higher priority = lower number)
-        # Use creation time as secondary sort (FIFO for same priority)
-        priority_key = (-job.current_priority, job.created_at.timestamp(), self._counter)
-        heapq.heappush(self._heap, (priority_key, job))
-        
         self._job_lookup[job.job_id] = job
+        now = time.monotonic_ns()
+        self._created_sum += job._created_ns
+        self._next_aging_at = min(self._next_aging_at, job.next_aging_at(now))
+        self._next_expiry_at = min(self._next_expiry_at, job._created_ns + job._max_wait_ns)
+        self._push_entry(job, job.current_priority_at(now), self._counter)
         self._counter += 1
         return True
     
-    def get_next_job(self) -> Optional[PriorityJob]:
+    def get_next_job(self, now: Optional[int] = None) -> Optional[PriorityJob]:
         """Get the highest priority job (doesn't remove it)"""
-        self._cleanup_expired_jobs()
-        self._rebalance_priorities()
+        self.refresh(now)
+        self._discard_dead_top()
         
         if not self._heap:
             return None
         
         _, job = self._heap[0]
-        return job if job.status == JobStatus.PENDING else None
+        return job
+    
+    def get_job(self, job_id: str, now: Optional[int] = None) -> Optional[PriorityJob]:
+        """Get a pending job by id without touching the heap"""
+        job = self._job_lookup.get(job_id)
+        if job is None:
+            return None
+        if now is None:
+            now = time.monotonic_ns()
+        # Expired jobs are only purged on refresh, so check here as well
+        return None if job.is_expired_at(now) else job
+    
+    def refresh(self, now: Optional[int] = None) -> int:
+        """Apply expiry and aging as of `now` (monotonic ns) and return the time used"""
+        if now is None:
+            now = time.monotonic_ns()
+        self._cleanup_expired_jobs(now)
+        self._rebalance_priorities(now)
+        return now
+    
+    def cleanup_expired(self, now: Optional[int] = None) -> int:
+        """Remove expired jobs and return how many were removed"""
+        if now is None:
+            now = time.monotonic_ns()
+        return self._cleanup_expired_jobs(now)
     
     def remove_job(self, job_id: str) -> Optional[PriorityJob]:
         """Remove and return a specific job"""
@@ -44,70 +86,163 @@ class PriorityQueue:
         job = self._job_lookup.pop(job_id)
         job.status = JobStatus.COMPLETED
         
-        # Rebuild heap without the removed job
-        self._rebuild_heap()
+        # Leave the heap entry in place; it is skipped or compacted away later
+        self._kill_entry(job)
+        self._maybe_compact()
         return job
     
-    def _cleanup_expired_jobs(self):
+    def _cleanup_expired_jobs(self, now: int) -> int:
         """Remove expired jobs from the queue"""
+        if now <= self._next_expiry_at:
+            return 0  # No job has passed its deadline yet
+        
         expired_jobs = []
-        for job_id, job in self._job_lookup.items():
-            if job.is_expired and job.status == JobStatus.PENDING:
+        next_expiry_at = float('inf')
+        for job in self._job_lookup.values():
+            if job.is_expired_at(now) and job.status is JobStatus.PENDING:
                 job.status = JobStatus.EXPIRED
-                expired_jobs.append(job_id)
+                expired_jobs.append(job)
+            else:
+                next_expiry_at = min(next_expiry_at, job._created_ns + job._max_wait_ns)
         
-        for job_id in expired_jobs:
-            del self._job_lookup[job_id]
+        self._next_expiry_at = next_expiry_at
+        for job in expired_jobs:
+            del self._job_lookup[job.job_id]
+            self._kill_entry(job)
         
         if expired_jobs:
-            self._rebuild_heap()
+            self._maybe_compact()
+        return len(expired_jobs)
     
-    def _rebalance_priorities(self):
-        """Rebalance heap when priorities have changed due to aging"""
-        needs_rebalance = False
+    def _rebalance_priorities(self, now: int):
+        """Re-push only the jobs whose priority has changed due to aging"""
+        if now < self._next_aging_at:
+            return  # No job has reached its next aging boundary yet
+        
+        aged_jobs = []
+        next_aging_at = float('inf')
+        
+        for job_id, job in self._job_lookup.items():
+            if job.status is JobStatus.PENDING:
+                priority = job.current_priority_at(now)
+                if priority != _key_priority(self._entry_keys[job_id]):
+                    aged_jobs.append((job, priority))
+                next_aging_at = min(next_aging_at, job.next_aging_at(now))
         
-        for _, job in self._heap:
-            if job.status == JobStatus.PENDING:
-                # Check if current priority differs significantly from heap position
-                needs_rebalance = True
-                break
+        self._next_aging_at = next_aging_at
+        for job, priority in aged_jobs:
+            # Keep the job's submission sequence so aging never costs it FIFO position
+            self._push_entry(job, priority, self._entry_keys[job.job_id] & _COUNTER_MASK)
         
-        if needs_rebalance:
-            self._rebuild_heap()
+        if aged_jobs:
+            self._maybe_compact()
     
-    def _rebuild_heap(self):
-        """Rebuild the heap with current priorities"""
-        active_jobs = [job for job in self._job_lookup.values() 
-                      if job.status == JobStatus.PENDING]
+    def _push_entry(self, job: PriorityJob, priority: int, sequence: int):
+        """Push a heap entry for job, superseding any entry it already has"""
+        # Invert priority for max-heap behavior (higher priority = lower number)
+        # Use creation time as secondary sort (FIFO for same priority)
+        created = job._created_ns + _TIME_BIAS
+        priority_key = ((((MAX_PRIORITY - priority) << _TIME_BITS) | created) << _COUNTER_BITS
+                        | (sequence & _COUNTER_MASK))
+        heapq.heappush(self._heap, (priority_key, job))
+        
+        old_key = self._entry_keys.get(job.job_id)
+        if old_key is not None:
+            self._dirty_count += 1
+            self._count_priority(_key_priority(old_key), -1)
+        self._entry_keys[job.job_id] = priority_key
+        self._count_priority(priority, 1)
+    
+    def _kill_entry(self, job: PriorityJob):
+        """Mark a job's heap entry as dead without touching the heap"""
+        priority_key = self._entry_keys.pop(job.job_id)
+        self._dirty_count += 1
+        self._count_priority(_key_priority(priority_key), -1)
+        self._created_sum -= job._created_ns
+    
+    def _count_priority(self, priority: int, delta: int):
+        count = self._priority_counts.get(priority, 0) + delta
+        if count:
+            self._priority_counts[priority] = count
+        else:
+            del self._priority_counts[priority]
+    
+    def _is_live(self, priority_key: int, job: PriorityJob) -> bool:
+        return self._entry_keys.get(job.job_id) == priority_key
+    
+    def _discard_dead_top(self):
+        """Pop dead entries until the top of the heap is a live job"""
+        while self._heap and not self._is_live(*self._heap[0]):
+            heapq.heappop(self._heap)
+            self._dirty_count -= 1
+    
+    def _maybe_compact(self):
+        """Rebuild the heap in linear time once most of it is dead entries"""
+        if self._dirty_count <= len(self._heap) // 2:
+            return
         
-        self._heap.clear()
-        for job in active_jobs:
-            priority_key = (-job.current_priority, job.created_at.timestamp(), self._counter)
-            heapq.heappush(self._heap, (priority_key, job))
-            self._counter += 1
+        self._heap = [(priority_key, self._job_lookup[job_id])
+                      for job_id, priority_key in self._entry_keys.items()]
+        heapq.heapify(self._heap)
+        self._dirty_count = 0
     
-    def get_queue_snapshot(self) -> List[dict]:
+    def get_queue_snapshot(self, now: Optional[int] = None) -> List[dict]:
         """Get current queue state for visualization"""
-        self._cleanup_expired_jobs()
-        self._rebalance_priorities()
+        now = self.refresh(now)
         
         snapshot = []
-        for _, job in sorted(self._heap):
-            if job.status == JobStatus.PENDING:
-                snapshot.append({
-                    'job_id': job.job_id,
-                    'user_id': job.user_id,
-                    'document_name': job.document_name,
-                    'initial_priority': job.initial_priority,
-                    'current_priority': job.current_priority,
-                    'wait_time': job.wait_time_seconds,
-                    'pages': job.pages,
-                    'created_at': job.created_at.isoformat()
-                })
+        for priority_key, job in self._live_entries_in_order():
+            snapshot.append({
+                'job_id': job.job_id,
+                'user_id': job.user_id,
+                'document_name': job.document_name,
+                'initial_priority': job.initial_priority,
+                'current_priority': _key_priority(priority_key),
+                'wait_time': job.wait_time_at(now),
+                'pages': job.pages,
+                'created_at': job.created_at_iso
+            })
         
         return snapshot
     
+    def get_queue_columns(self, now: Optional[int] = None) -> Dict[str, list]:
+        """Get current queue state as one list per field, in print order"""
+        now = self.refresh(now)
+        
+        entries = self._live_entries_in_order()
+        jobs = [job for _, job in entries]
+        created = [job._created_ns for job in jobs]
+        # Epoch seconds are derived from one wall-clock sample instead of per-job datetimes
+        epoch_offset_ns = time.time_ns() - now
+        
+        return {
+            'job_id': [job.job_id for job in jobs],
+            'user_id': [job.user_id for job in jobs],
+            'document_name': [job.document_name for job in jobs],
+            'initial_priority': [job.initial_priority for job in jobs],
+            'current_priority': [_key_priority(priority_key) for priority_key, _ in entries],
+            'wait_time': [(now - created_ns) / 1_000_000_000 for created_ns in created],
+            'pages': [job.pages for job in jobs],
+            'created_at': [(created_ns + epoch_offset_ns) / 1_000_000_000 for created_ns in created]
+        }
+    
+    def _live_entries_in_order(self) -> List[Tuple[int, PriorityJob]]:
+        """Get the live heap entries sorted into print order"""
+        return sorted(entry for entry in self._heap if self._is_live(*entry))
+    
+    def get_statistics(self, now: int) -> dict:
+        """Get running aggregates as of the last cleanup and rebalance"""
+        total_jobs = len(self._entry_keys)
+        if total_jobs == 0:
+            return {'total_jobs': 0, 'avg_wait_time': 0, 'priority_distribution': {}}
+        
+        return {
+            'total_jobs': total_jobs,
+            'avg_wait_time': (now * total_jobs - self._created_sum) / total_jobs / 1_000_000_000,
+            'priority_distribution': dict(sorted(self._priority_counts.items(), reverse=True))
+        }
+    
     def size(self) -> int:
         """Get number of pending jobs"""
-        return len([job for job in self._job_lookup.values() 
-                   if job.status == JobStatus.PENDING])
\ No newline at end of file
+        # Removed and expired jobs leave the lookup, so everything left is pending
+        return len(self._job_lookup)
\ No newline at end of file